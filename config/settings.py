@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 
 from pathlib import Path
 
+import orjson
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -36,12 +38,14 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'drf_spectacular',
     'posts',
 ]
 
 MIDDLEWARE = [
+    'django.middleware.gzip.GZipMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -84,8 +88,30 @@ DATABASES = {
         'PASSWORD': '1234',
         'HOST': 'localhost',
         'PORT': '5432',
+        # OPTIONS['pool']을 쓰지 않을 때는 요청마다 새로 연결하지 않고 연결을 재사용한다.
+        # (pool을 켜면 CONN_MAX_AGE는 0이어야 한다.)
+        'CONN_MAX_AGE': 60,
+    }
+}
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': 'redis://127.0.0.1:6379/1',
+        'OPTIONS': {
+            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            # Redis 장애 시 캐시 miss로 동작한다. 쓰기 요청이 커밋된 뒤 캐시 오류로 500이 나면
+            # 클라이언트가 재시도해서 중복 저장이 생긴다.
+            'IGNORE_EXCEPTIONS': True,
+            'SOCKET_CONNECT_TIMEOUT': 1,
+            'SOCKET_TIMEOUT': 1,
+        },
     }
 }
+DJANGO_REDIS_LOG_IGNORED_EXCEPTIONS = True
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -113,8 +139,20 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.DjangoModelPermissionsOrAnonReadOnly'
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_RENDERER_CLASSES': [
+        'drf_orjson_renderer.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    # Keep the "Z" suffix DRF's own encoder uses for UTC datetimes
+    'ORJSON_RENDERER_OPTIONS': (orjson.OPT_UTC_Z,),
+    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'PAGE_SIZE': 100,
 }
 
+# ?stream=true 로 페이지네이션 없이 전체 목록을 스트리밍한다. 익명 요청도 PAGE_SIZE 제한을 건너뛰게 되므로
+# 기본값은 끄고, 내부 배치 작업 등 필요한 환경에서만 켠다.
+POSTS_LIST_STREAMING = False
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
@@ -0,0 +1,13 @@
+import time
+
+from django.core.cache import cache
+
+# 목록 응답 캐시. 키에 목록 버전을 넣고, 쓰기 요청이 들어오면 버전을 바꿔 이전 키를 모두 무효화한다.
+POST_LIST_CACHE_PREFIX = 'posts:list:'
+POST_LIST_CACHE_VERSION_KEY = 'posts:list-version'
+POST_LIST_CACHE_TIMEOUT = 60
+
+
+def invalidate_post_list_cache():
+    """목록 버전을 바꿔 캐시된 모든 목록 응답을 무효화한다. 게시글을 쓰는 모든 경로에서 호출한다."""
+    cache.set(POST_LIST_CACHE_VERSION_KEY, time.time_ns(), timeout=None)
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.7 on 2026-10-14 09:12
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0001_initial'),
+    ]
+
+    operations = [
+        # A regular column can't be altered into a generated one, so it is re-added.
+        migrations.RemoveField(
+            model_name='post',
+            name='content_search',
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='content_search',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('content', config='simple'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+    ]
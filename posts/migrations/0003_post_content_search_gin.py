@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-14 08:40
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0002_post_content_search_generated'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['content_search'], name='post_content_search_gin'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.7 on 2026-10-14 09:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import posts.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0003_post_content_search_gin'),
+    ]
+
+    operations = [
+        # PostgreSQL can't change the type of a column a generated column depends on,
+        # so content_search (and its index) is dropped and rebuilt around the type change.
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_content_search_gin',
+        ),
+        migrations.RemoveField(
+            model_name='post',
+            name='content_search',
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='content',
+            field=models.JSONField(),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='content_search',
+            field=models.GeneratedField(db_persist=True, expression=posts.models.JSONBToTSVector('content'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['content_search'], name='post_content_search_gin'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.7 on 2026-10-14 09:04
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+import posts.models
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0005_post_trgm_indexes'),
+    ]
+
+    operations = [
+        # jsonb_path_query는 집합을 반환하므로 인덱스 표현식에 바로 쓸 수 없어 IMMUTABLE 함수로 감싼다.
+        migrations.RunSQL(
+            sql="""
+                CREATE OR REPLACE FUNCTION posts_jsonb_values_text(document jsonb) RETURNS text
+                LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE
+                AS $$
+                    SELECT string_agg(item #>> '{}', ' ')
+                    FROM jsonb_path_query(document, 'strict $.** ? (@.type() != "object" && @.type() != "array")') AS item
+                $$
+            """,
+            reverse_sql='DROP FUNCTION IF EXISTS posts_jsonb_values_text(jsonb)',
+        ),
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_content_trgm',
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(posts.models.JSONBValuesText('content')), name='gin_trgm_ops'), name='post_content_values_trgm'),
+        ),
+    ]
@@ -1,34 +1,90 @@
-import json
-
-from django.db import models
+from django.db import connections, models, router
 from django.db.models import functions
-from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchConfig, SearchVectorField
+from django.utils import timezone
 
 # Create your models here.
 
-class Post(models.Model):
-    title = models.CharField(max_length=120)
-    content = models.TextField()
-    date_posted = models.DateTimeField(auto_now_add=True)
-    content_search = SearchVectorField(
-        null=True
-    )
+class JSONBToTSVector(models.Func):
+    """
+    jsonb_to_tsvector(config, document, filter)
+    JSON 문법(괄호, 따옴표)이 아닌 값 자체를 토큰화한다. filter가 "all"이면 key도 포함된다.
+    """
+    function = 'jsonb_to_tsvector'
+    output_field = SearchVectorField()
 
-    def __str__(self):
-        return self.title
+    def __init__(self, expression, config='simple', json_filter='["all"]'):
+        super().__init__(
+            SearchConfig.from_parameter(config),
+            expression,
+            functions.Cast(models.Value(json_filter), output_field=models.JSONField()),
+        )
 
+
+class JSONBValuesText(models.Func):
     """
-    데이터를 변환해서 넣고 싶으면 functions.Cast를 사용하면 된다.
+    posts_jsonb_values_text(document)
+    JSON의 key와 괄호, 따옴표를 빼고 scalar 값만 공백으로 이어 붙인 문자열을 만든다.
+    SQL 함수는 0006 마이그레이션에서 IMMUTABLE로 생성되므로 인덱스 표현식에 쓸 수 있다.
     """
-    def save(self, *args, **kwargs):
+    function = 'posts_jsonb_values_text'
+    output_field = models.TextField()
+
 
-        json_content = json.loads(self.content)
+class PostManager(models.Manager):
+    def copy_rows(self, rows):
+        """
+        (title, content) 행들을 INSERT 대신 COPY 한 번으로 적재한다.
+        content는 JSON 문자열이어야 하고, content_search는 generated column이라 DB가 채운다.
+        """
+        connection = connections[self._db or router.db_for_write(self.model)]
+        quote_name = connection.ops.quote_name
+        opts = self.model._meta
+        columns = ', '.join(
+            quote_name(opts.get_field(name).column) for name in ('title', 'content', 'date_posted')
+        )
+        date_posted = timezone.now()
 
-        content_string = str(json_content)
+        count = 0
+        with connection.cursor() as cursor:
+            with cursor.copy(f'COPY {quote_name(opts.db_table)} ({columns}) FROM STDIN') as copy:
+                for title, content in rows:
+                    copy.write_row((title, content, date_posted))
+                    count += 1
 
-        self.content_search = SearchVector(
-                    functions.Cast(models.Value(content_string),
-                                   output_field=models.TextField())
-                )
+        return count
 
-        return super(Post, self).save(*args, **kwargs)
\ No newline at end of file
+
+class Post(models.Model):
+    title = models.CharField(max_length=120)
+    content = models.JSONField()
+    date_posted = models.DateTimeField(auto_now_add=True)
+    # 검색 벡터는 PostgreSQL이 generated column으로 직접 계산한다.
+    # 저장할 때마다 Python에서 JSON을 파싱하거나 SearchVector를 만들지 않아도 항상 content와 동기화된다.
+    content_search = models.GeneratedField(
+        expression=JSONBToTSVector('content'),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = PostManager()
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['content_search'], name='post_content_search_gin'),
+            # icontains 조회용 trigram 인덱스. Django의 icontains는 UPPER(col::text) LIKE UPPER(...)로
+            # 변환되므로 같은 표현식으로 인덱스를 만들어야 planner가 사용할 수 있다.
+            # content는 직렬화된 jsonb 전체가 아니라 값만 대상으로 한다. key나 JSON 문법 문자까지 매칭되면 안 된다.
+            GinIndex(
+                OpClass(functions.Upper(functions.Cast('title', output_field=models.TextField())), name='gin_trgm_ops'),
+                name='post_title_trgm',
+            ),
+            GinIndex(
+                OpClass(functions.Upper(JSONBValuesText('content')), name='gin_trgm_ops'),
+                name='post_content_values_trgm',
+            ),
+        ]
+
+    def __str__(self):
+        return self.title
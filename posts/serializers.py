@@ -1,3 +1,6 @@
+import json
+
+from django.db import models
 from rest_framework import serializers
 
 from .models import Post
@@ -6,4 +9,35 @@ from .models import Post
 class PostSerializer(serializers.ModelSerializer):
     class Meta:
         model = Post
-        fields = ('id', 'title', 'content')
\ No newline at end of file
+        fields = ('id', 'title', 'content')
+
+    def update(self, instance, validated_data):
+        serializers.raise_errors_on_nested_writes('update', self, validated_data)
+
+        # 값이 바뀐 컬럼만 UPDATE 한다. content가 그대로면 content_search와 GIN 인덱스도 다시 계산되지 않는다.
+        update_fields = []
+        for attr, value in validated_data.items():
+            if self._has_changed(instance, attr, value):
+                setattr(instance, attr, value)
+                update_fields.append(attr)
+
+        instance.save(update_fields=update_fields)
+        return instance
+
+    @staticmethod
+    def _has_changed(instance, attr, value):
+        old = getattr(instance, attr)
+        field = instance._meta.get_field(attr)
+        if isinstance(field, models.JSONField):
+            # Python에서는 1 == 1.0 == True, 0 == False 이므로 JSON으로 직렬화해서 타입까지 비교한다.
+            return (
+                json.dumps(old, cls=field.encoder, sort_keys=True)
+                != json.dumps(value, cls=field.encoder, sort_keys=True)
+            )
+        return old != value
+
+
+class PostListSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Post
+        fields = ('id', 'title', 'date_posted')
@@ -1,3 +1,345 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.postgres.search import SearchQuery
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from drf_orjson_renderer.renderers import ORJSONRenderer
+from rest_framework.test import APIClient
+
+from .models import Post
+
+# 테스트는 Redis 없이도 돌 수 있도록 로컬 메모리 캐시를 사용한다.
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class PostAPITestCase(TestCase):
+    def setUp(self):
+        # LocMemCache는 테스트가 끝나도 비워지지 않으므로 이전 테스트의 목록 캐시/버전이 남지 않게 한다.
+        cache.clear()
+        self.client = APIClient()
+
+
+class PostBulkTests(PostAPITestCase):
+    def test_bulk_round_trips_copy_special_characters(self):
+        # COPY 텍스트 포맷/CSV에서 이스케이프가 필요한 문자들이 그대로 저장되어야 한다.
+        items = [
+            {'title': 'a,b', 'content': {'body': 'comma,separated "quoted"\ttab\nnewline\\backslash'}},
+            {'title': 'tab\there', 'content': ['line1\nline2', 'x,y', '"q"']},
+        ]
+
+        response = self.client.post('/posts/bulk/', items, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {'created': 2})
+        self.assertEqual(
+            list(Post.objects.order_by('id').values_list('title', 'content')),
+            [(item['title'], item['content']) for item in items],
+        )
+
+    def test_bulk_accepts_integers_beyond_64_bits(self):
+        items = [{'title': 'big', 'content': {'n': 2 ** 70, 'm': -(2 ** 70)}}]
+
+        response = self.client.post('/posts/bulk/', items, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Post.objects.get().content, items[0]['content'])
+
+    def test_bulk_populates_content_search(self):
+        items = [{'title': 'search', 'content': {'body': 'generated column keyword'}}]
+
+        self.client.post('/posts/bulk/', items, format='json')
+
+        self.assertTrue(
+            Post.objects.filter(content_search=SearchQuery('keyword', config='simple')).exists()
+        )
+
+    def test_bulk_rejects_non_list_body(self):
+        response = self.client.post('/posts/bulk/', {'title': 't', 'content': {}}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Post.objects.exists())
+
+    def test_bulk_empty_list_creates_nothing(self):
+        response = self.client.post('/posts/bulk/', [], format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {'created': 0})
+
+
+class PostUpdateTests(PostAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.post = Post.objects.create(title='title', content={'body': 'content'})
+        self.url = f'/posts/{self.post.pk}/'
+
+    def update_queries(self, data):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.put(self.url, data, format='json')
+        self.assertEqual(response.status_code, 200)
+        return [query['sql'] for query in ctx.captured_queries if query['sql'].startswith('UPDATE')]
+
+    def test_identical_put_issues_no_update(self):
+        queries = self.update_queries({'title': 'title', 'content': {'body': 'content'}})
+
+        self.assertEqual(queries, [])
+
+    def test_title_only_change_updates_only_title(self):
+        queries = self.update_queries({'title': 'changed', 'content': {'body': 'content'}})
+
+        self.assertEqual(len(queries), 1)
+        self.assertIn('SET "title"', queries[0])
+        self.assertNotIn('"content"', queries[0])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.title, 'changed')
+
+    def test_json_type_change_is_saved(self):
+        # 1 == True, 0 == False 이지만 JSON 값으로는 다르므로 저장되어야 한다.
+        for old, new in ((1, True), ({'a': 0}, {'a': False}), (1, 1.5), ([1], [1.0])):
+            with self.subTest(old=old, new=new):
+                Post.objects.filter(pk=self.post.pk).update(content=old)
+                self.post.refresh_from_db()
+
+                queries = self.update_queries({'title': 'title', 'content': new})
+
+                self.assertEqual(len(queries), 1)
+                self.post.refresh_from_db()
+                self.assertEqual(json.dumps(self.post.content), json.dumps(new))
+
+
+class PostSearchTests(PostAPITestCase):
+    def setUp(self):
+        super().setUp()
+        Post.objects.create(title='Django tips', content={'body': 'Use select_related', 'tags': ['orm']})
+        Post.objects.create(title='Postgres', content={'body': 'trigram index', 'meta': {'note': 'Nested Value'}})
+
+    def titles(self, **params):
+        response = self.client.get('/posts/', params)
+        self.assertEqual(response.status_code, 200)
+        return [row['title'] for row in response.json()['results']]
+
+    def test_q_matches_title_case_insensitively(self):
+        self.assertEqual(self.titles(q='DJANGO'), ['Django tips'])
+
+    def test_q_matches_nested_content_values(self):
+        self.assertEqual(self.titles(q='nested val'), ['Postgres'])
+        self.assertEqual(self.titles(q='orm'), ['Django tips'])
+
+    def test_q_ignores_json_keys_and_syntax(self):
+        for q in ('body', 'note', '"', '{', '":'):
+            with self.subTest(q=q):
+                self.assertEqual(self.titles(q=q), [])
+
+    def test_search_matches_content_tokens(self):
+        self.assertEqual(self.titles(search='trigram'), ['Postgres'])
+        self.assertEqual(self.titles(search='missing'), [])
+
+    def test_search_is_not_applied_to_detail(self):
+        post = Post.objects.get(title='Postgres')
+
+        response = self.client.get(f'/posts/{post.pk}/', {'search': 'missing', 'q': 'missing'})
+
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(POSTS_LIST_STREAMING=True)
+class PostListStreamTests(PostAPITestCase):
+    def stream(self):
+        response = self.client.get('/posts/', {'stream': 'true'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content)
+
+    def expected(self):
+        rows = list(Post.objects.order_by('id').values('id', 'title', 'date_posted'))
+        return ORJSONRenderer().render(rows)
+
+    def test_stream_matches_rendered_list_across_chunks(self):
+        # 조각 경계([1:-1]로 잘라 이어 붙이는 부분)를 지나도록 chunk 크기를 줄인다.
+        Post.objects.bulk_create(
+            Post(title=f'title "{i}", ok', content={'body': i}) for i in range(5)
+        )
+
+        with mock.patch('posts.views.POST_LIST_STREAM_CHUNK_SIZE', 2):
+            body = self.stream()
+
+        self.assertEqual(body, self.expected())
+
+    def test_stream_empty_list(self):
+        self.assertEqual(self.stream(), b'[]')
+
+    def test_default_list_is_paginated(self):
+        response = self.client.get('/posts/')
+
+        self.assertFalse(response.streaming)
+        self.assertIn('results', response.json())
+
+    @override_settings(POSTS_LIST_STREAMING=False)
+    def test_stream_is_ignored_when_disabled(self):
+        response = self.client.get('/posts/', {'stream': 'true'})
+
+        self.assertFalse(response.streaming)
+        self.assertIn('results', response.json())
+
+    def test_stream_rejects_non_json_format(self):
+        response = self.client.get('/posts/', {'stream': 'true', 'format': 'api'})
+
+        self.assertEqual(response.status_code, 406)
+
+
+class PostListCacheTests(PostAPITestCase):
+    def titles(self):
+        response = self.client.get('/posts/')
+        self.assertEqual(response.status_code, 200)
+        return [row['title'] for row in response.json()['results']]
+
+    def test_list_is_served_from_cache(self):
+        self.assertEqual(self.titles(), [])
+
+        # API를 거치지 않은 쓰기는 버전을 바꾸지 않으므로 캐시된 목록이 그대로 나온다.
+        Post.objects.create(title='direct', content={})
+
+        self.assertEqual(self.titles(), [])
+
+    def test_create_invalidates_list(self):
+        self.assertEqual(self.titles(), [])
+
+        self.client.post('/posts/', {'title': 'created', 'content': {}}, format='json')
+
+        self.assertEqual(self.titles(), ['created'])
+
+    def test_update_invalidates_list(self):
+        post = Post.objects.create(title='before', content={})
+        self.assertEqual(self.titles(), ['before'])
+
+        self.client.put(f'/posts/{post.pk}/', {'title': 'after', 'content': {}}, format='json')
+
+        self.assertEqual(self.titles(), ['after'])
+
+    def test_delete_invalidates_list(self):
+        post = Post.objects.create(title='deleted', content={})
+        self.assertEqual(self.titles(), ['deleted'])
+
+        self.client.delete(f'/posts/{post.pk}/')
+
+        self.assertEqual(self.titles(), [])
+
+    def test_bulk_invalidates_list(self):
+        self.assertEqual(self.titles(), [])
+
+        self.client.post('/posts/bulk/', [{'title': 'bulk', 'content': {}}], format='json')
+
+        self.assertEqual(self.titles(), ['bulk'])
+
+
+class LoadPostsCommandTests(PostAPITestCase):
+    def setUp(self):
+        super().setUp()
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.tmpdir = tmpdir.name
+
+    def write_csv(self, data):
+        path = os.path.join(self.tmpdir, 'posts.csv')
+        with open(path, 'wb') as f:
+            f.write(data.encode() if isinstance(data, str) else data)
+        return path
+
+    def load(self, path):
+        out = StringIO()
+        call_command('load_posts', file=path, stdout=out)
+        return out.getvalue()
+
+    def index_names(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT indexname FROM pg_indexes WHERE tablename = %s", [Post._meta.db_table])
+            return {row[0] for row in cursor.fetchall()}
+
+    def test_loads_rows_rebuilds_indexes_and_invalidates_list(self):
+        self.assertEqual(self.client.get('/posts/').json()['count'], 0)
+        path = self.write_csv('title,content\n"a, b","{""body"": ""x, \\""y\\""""}"\nc,"[1, 2]"\n')
+
+        output = self.load(path)
+
+        self.assertIn('Loaded 2 posts', output)
+        self.assertEqual(
+            list(Post.objects.order_by('id').values_list('title', 'content')),
+            [('a, b', {'body': 'x, "y"'}), ('c', [1, 2])],
+        )
+        self.assertTrue({index.name for index in Post._meta.indexes} <= self.index_names())
+        self.assertEqual(self.client.get('/posts/').json()['count'], 2)
+
+    def test_missing_file(self):
+        with self.assertRaisesMessage(CommandError, 'Cannot open'):
+            self.load(os.path.join(self.tmpdir, 'missing.csv'))
+
+    def test_missing_header_column(self):
+        path = self.write_csv('name,content\na,{}\n')
+
+        with self.assertRaisesMessage(CommandError, 'CSV header is missing column(s): title'):
+            self.load(path)
+
+    def test_undecodable_csv(self):
+        path = self.write_csv(b'title,content\n\xff,{}\n')
+
+        with self.assertRaisesMessage(CommandError, 'Invalid CSV'):
+            self.load(path)
+
+    def test_invalid_json_rolls_back(self):
+        path = self.write_csv('title,content\na,{}\nb,{not json\n')
+
+        with self.assertRaisesMessage(CommandError, 'Failed to load posts'):
+            self.load(path)
+
+        self.assertFalse(Post.objects.exists())
+        self.assertTrue({index.name for index in Post._meta.indexes} <= self.index_names())
+
+
+# 연결할 수 없는 Redis. IGNORE_EXCEPTIONS가 켜져 있으면 캐시 오류는 miss로 처리되어야 한다.
+UNREACHABLE_REDIS_CACHES = {
+    'default': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': 'redis://127.0.0.1:1/1',
+        'OPTIONS': {
+            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            'IGNORE_EXCEPTIONS': True,
+            'SOCKET_CONNECT_TIMEOUT': 1,
+            'SOCKET_TIMEOUT': 1,
+        },
+    }
+}
+
+
+@override_settings(CACHES=UNREACHABLE_REDIS_CACHES)
+class PostRedisDownTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_requests_succeed_without_redis(self):
+        with self.assertLogs('django_redis.cache', 'ERROR'):
+            response = self.client.post('/posts/', {'title': 'one', 'content': {}}, format='json')
+            self.assertEqual(response.status_code, 201)
+            post_id = response.json()['id']
+
+            response = self.client.get('/posts/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([row['title'] for row in response.json()['results']], ['one'])
+
+            response = self.client.put(f'/posts/{post_id}/', {'title': 'two', 'content': {}}, format='json')
+            self.assertEqual(response.status_code, 200)
+
+            response = self.client.post('/posts/bulk/', [{'title': 'three', 'content': {}}], format='json')
+            self.assertEqual(response.status_code, 201)
+
+            response = self.client.delete(f'/posts/{post_id}/')
+            self.assertEqual(response.status_code, 204)
+
+        # 캐시 오류로 500이 나서 재시도하는 일이 없으므로 쓰기는 한 번씩만 반영된다.
+        self.assertEqual(list(Post.objects.values_list('title', flat=True)), ['three'])
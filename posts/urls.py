@@ -9,6 +9,11 @@ urlpatterns = [
             'post': 'create'
         }
     )),
+    path('bulk/', PostViewSet.as_view(
+        {
+            'post': 'bulk'
+        }
+    )),
     path('<int:pk>/', PostViewSet.as_view(
         {
             'get': 'retrieve',
@@ -1,9 +1,30 @@
+import json
+import time
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery
+from django.core.cache import cache
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotAcceptable
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
-import json
+import orjson
+
+from .cache import (
+    POST_LIST_CACHE_PREFIX,
+    POST_LIST_CACHE_TIMEOUT,
+    POST_LIST_CACHE_VERSION_KEY,
+    invalidate_post_list_cache,
+)
+from .models import JSONBValuesText, Post
+from .serializers import PostListSerializer, PostSerializer
 
-from .models import Post
-from .serializers import PostSerializer
+# 페이지네이션 없이 전체 목록을 내려줄 때 한 번에 직렬화해서 보내는 행 수
+POST_LIST_STREAM_CHUNK_SIZE = 500
 
 
 class PostViewSet(ModelViewSet):
@@ -12,6 +33,129 @@ class PostViewSet(ModelViewSet):
     permission_classes = []
     authentication_classes = []
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        # 검색 조건은 목록에만 적용한다. get_object()도 get_queryset()을 쓰므로
+        # 상세/수정/삭제에 적용하면 존재하는 게시글이 404가 된다.
+        if self.action == 'list':
+            # ?search= 는 content_search GIN 인덱스를 타는 @@ 검색으로 처리한다.
+            search = self.request.query_params.get('search')
+            if search:
+                queryset = queryset.filter(content_search=SearchQuery(search, config='simple'))
+
+            # ?q= 는 제목/본문 부분 문자열 검색(icontains)으로 처리한다. pg_trgm 인덱스를 탄다.
+            # 본문은 jsonb 값만 비교하므로 key나 따옴표, 괄호로는 매칭되지 않는다.
+            q = self.request.query_params.get('q')
+            if q:
+                queryset = queryset.alias(content_values=JSONBValuesText('content')).filter(
+                    Q(title__icontains=q) | Q(content_values__icontains=q)
+                )
+
+        return queryset
+
+    @property
+    def paginator(self):
+        # POSTS_LIST_STREAMING이 켜져 있을 때만 ?stream=true 요청을 페이지로 나누지 않고 전체를 스트리밍한다.
+        if self._is_stream_request():
+            return None
+        return super().paginator
+
+    def _is_stream_request(self):
+        return (
+            settings.POSTS_LIST_STREAMING
+            and self.action == 'list'
+            and self.request.query_params.get('stream') in ('1', 'true')
+        )
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return PostListSerializer
+        return super().get_serializer_class()
+
+    def list(self, request, *args, **kwargs):
+        # 버전은 DB 조회 전에 읽는다. 조회 중에 쓰기가 일어나면 버전이 바뀌므로
+        # 이 요청이 늦게 저장하는 오래된 결과는 새 버전의 키로는 읽히지 않는다.
+        version = cache.get_or_set(POST_LIST_CACHE_VERSION_KEY, time.time_ns, timeout=None)
+        cache_key = f'{POST_LIST_CACHE_PREFIX}{version}:{request.GET.urlencode()}'
+        data = cache.get(cache_key)
+        if data is not None:
+            return Response(data)
+
+        response = self._list_response()
+        # 스트리밍 응답은 본문이 아직 만들어지지 않았으므로 캐시하지 않는다.
+        if response.status_code == 200 and not response.streaming:
+            cache.set(cache_key, response.data, POST_LIST_CACHE_TIMEOUT)
+
+        return response
+
+    def _list_response(self):
+        # 목록은 필요한 컬럼만 values()로 읽고 serializer를 거치지 않고 그대로 응답한다.
+        # PostListSerializer는 API 스키마 문서화에만 사용된다.
+        queryset = self.filter_queryset(self.get_queryset())
+        queryset = queryset.order_by('id').values(*PostListSerializer.Meta.fields)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(page)
+
+        # 스트리밍 응답은 renderer를 거치지 않고 JSON을 직접 만들기 때문에 JSON 외의 형식은 거부한다.
+        if self.request.accepted_renderer.format != 'json':
+            raise NotAcceptable('Streaming is only available as JSON (use ?format=json).')
+
+        return self._stream_list(queryset)
+
+    @staticmethod
+    def _stream_list(queryset):
+        """
+        ?stream=true 요청에서 전체 목록을 메모리에 한 번에 만들지 않고
+        POST_LIST_STREAM_CHUNK_SIZE 행씩 JSON 배열 조각으로 내려보낸다.
+        """
+        def dump(rows):
+            # 배열의 대괄호를 떼어내고 조각끼리 이어 붙인다.
+            return orjson.dumps(rows, option=orjson.OPT_UTC_Z)[1:-1]
+
+        def chunks():
+            yield b'['
+            rows = []
+            separator = b''
+            for row in queryset.iterator(chunk_size=POST_LIST_STREAM_CHUNK_SIZE):
+                rows.append(row)
+                if len(rows) == POST_LIST_STREAM_CHUNK_SIZE:
+                    yield separator + dump(rows)
+                    separator = b','
+                    rows = []
+            if rows:
+                yield separator + dump(rows)
+            yield b']'
+
+        return StreamingHttpResponse(chunks(), content_type='application/json')
+
     def perform_create(self, serializer):
-        content = self.request.data.get('content', '')
-        serializer.save(content=json.dumps(content))
+        super().perform_create(serializer)
+        invalidate_post_list_cache()
+
+    @action(methods=['post'], detail=False)
+    def bulk(self, request):
+        # 여러 게시글을 행마다 INSERT 하지 않고 COPY 한 번으로 저장한다.
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        # content는 모델 JSONField와 같은 인코더(json.dumps)로 직렬화한다.
+        # orjson은 64비트를 넘는 정수를 거부하지만 jsonb와 POST /posts/는 받아들인다.
+        encoder = Post._meta.get_field('content').encoder
+        count = Post.objects.copy_rows(
+            (item['title'], json.dumps(item['content'], cls=encoder))
+            for item in serializer.validated_data
+        )
+        invalidate_post_list_cache()
+
+        return Response({'created': count}, status=status.HTTP_201_CREATED)
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        invalidate_post_list_cache()
+
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        invalidate_post_list_cache()
@@ -1,17 +1,17 @@
 from django.core.exceptions import ImproperlyConfigured
 from django.db.backends.base.base import NO_DB_ALIAS
 from django.db.backends.postgresql.base import DatabaseWrapper as PostgresDatabaseWrpper
+from psycopg import OperationalError
 import logging
 import time
 import threading
-from datetime import datetime, timedelta
+from datetime import datetime
 
 
 class DatabaseWrapper(PostgresDatabaseWrpper):
     # Class-level pool storage and settings
     _connection_pools = {}
     _pool_settings = {}
-    _pool_monitor = None
     _lock = threading.RLock()
 
     def __init__(self, settings_dict, alias=None):
@@ -19,9 +19,11 @@ class DatabaseWrapper(PostgresDatabaseWrpper):
         self.min_connections = settings_dict.get('MIN_CONNECTIONS', 20)
         self.max_connections = settings_dict.get('MAX_CONNECTIONS', 100)  # Reduced default
         self.max_overflow = settings_dict.get('MAX_OVERFLOW', 10)  # Reduced default
-        self.timeout = settings_dict.get('POOL_TIMEOUT', 3000)
+        self.timeout = settings_dict.get('POOL_TIMEOUT', 3000)  # milliseconds
+        self.max_waiting = settings_dict.get('POOL_MAX_WAITING', 0)  # 0 = unlimited queue
         self.max_conn_age = settings_dict.get('POOL_MAX_CONN_AGE', 1800)  # 30 minutes
-        self.recycle_threshold = settings_dict.get('POOL_RECYCLE_THRESHOLD', 0.8)  # 80%
+        self.max_idle = settings_dict.get('POOL_MAX_IDLE', 600)  # 10 minutes
+        self._cached_pool = None  # Resolved pool, memoized by the pool property
 
         # Store settings for this alias
         if alias and alias != NO_DB_ALIAS:
@@ -33,66 +35,37 @@ class DatabaseWrapper(PostgresDatabaseWrpper):
                 'created_at': datetime.now()
             }
 
-            # Start monitor thread if not already running
-            if DatabaseWrapper._pool_monitor is None:
-                DatabaseWrapper._start_pool_monitor()
-
-    @classmethod
-    def _start_pool_monitor(cls):
-        """Start a background thread to monitor connection pools"""
-
-        def monitor_pools():
-            while True:
-                try:
-                    cls._check_all_pools()
-                except Exception as e:
-                    logging.error(f"Error in pool monitor: {e}")
-                time.sleep(300)  # Check every 5 minutes
-
-        cls._pool_monitor = threading.Thread(
-            target=monitor_pools,
-            daemon=True,
-            name="db-pool-monitor"
-        )
-        cls._pool_monitor.start()
-
-    @classmethod
-    def _check_all_pools(cls):
-        """Check all pools for potential issues and clean up if needed"""
-        now = datetime.now()
-        with cls._lock:
-            for alias, settings in cls._pool_settings.items():
-                if alias in cls._connection_pools:
-                    pool = cls._connection_pools[alias]
-                    # Check if pool is overloaded
-                    if pool.busy > settings['max_connections'] * cls._pool_settings[alias]['recycle_threshold']:
-                        logging.warning(f"Pool {alias} is nearing capacity, recycling connections")
-                        try:
-                            pool.resize(settings['min_connections'])
-                        except Exception as e:
-                            logging.error(f"Failed to resize pool {alias}: {e}")
-
-                    # Check pool age
-                    age = now - settings.get('created_at', now)
-                    if age > timedelta(seconds=settings.get('max_conn_age', 1800)):
-                        logging.info(f"Pool {alias} has reached max age, recreating")
-                        try:
-                            pool.close()
-                            del cls._connection_pools[alias]
-                        except Exception as e:
-                            logging.error(f"Error closing aged pool {alias}: {e}")
-
     @property
     def pool(self):
         """Get or create a connection pool for this database alias"""
+        pool = self._cached_pool
+        if pool is not None and not pool.closed:
+            return pool
+
         pool_options = self.settings_dict["OPTIONS"].get("pool")
         if self.alias == NO_DB_ALIAS or not pool_options:
             return None
 
+        # Lock-free fast path: dict reads are atomic, so the lock is only
+        # needed when the pool has to be created
+        pool = self._connection_pools.get(self.alias)
+        if pool is not None:
+            self._cached_pool = pool
+            return pool
+
         with DatabaseWrapper._lock:
             if self.alias not in self._connection_pools:
+                # Only enforced with pooling on; without OPTIONS["pool"] Django's own
+                # persistent connections (CONN_MAX_AGE) are used as is
                 if self.settings_dict.get("CONN_MAX_AGE", 0) != 0:
-                    raise ImproperlyConfigured("Pooling doesn't support persistent connections.")
+                    raise ImproperlyConfigured(
+                        "Pooling doesn't support persistent connections. "
+                        "Set CONN_MAX_AGE to 0 or disable OPTIONS['pool']."
+                    )
+
+                # Connection rotation is handled by the pool's own worker threads:
+                # connections older than max_lifetime or idle longer than max_idle
+                # are replaced, so no separate monitor thread is needed.
 
                 # Set the default options
                 if pool_options is True:
@@ -114,18 +87,34 @@ class DatabaseWrapper(PostgresDatabaseWrpper):
                     open=True,
                     configure=self._configure_connection,
                     min_size=self.min_connections,
-                    max_size=self.max_connections,
-                    max_overflow=self.max_overflow,
-                    timeout=self.timeout,
-                    check=ConnectionPool.check_connection if enable_checks else None,
-                    reset=True,  # Reset connections when returned to pool
+                    max_size=self.max_connections + self.max_overflow,  # psycopg_pool has no separate overflow
+                    # getconn() waits in the pool's queue for up to timeout seconds
+                    timeout=self.timeout / 1000,
+                    max_waiting=self.max_waiting,
+                    max_lifetime=self.max_conn_age,
+                    max_idle=self.max_idle,
+                    reconnect_failed=self._pool_reconnect_failed,
+                    # No reset callback: the pool already rolls back connections returned mid-transaction
+                    check=ConnectionPool.check_connection if enable_checks else self._check_connection_state,
                     **pool_options,
                 )
 
                 self._connection_pools[self.alias] = pool
                 self._pool_settings[self.alias]['created_at'] = datetime.now()
 
-            return self._connection_pools[self.alias]
+            self._cached_pool = self._connection_pools[self.alias]
+            return self._cached_pool
+
+    @staticmethod
+    def _pool_reconnect_failed(pool):
+        """Called by the pool when it gives up trying to reach the server"""
+        logging.error(f"Pool {pool.name} failed to reconnect to the database")
+
+    @staticmethod
+    def _check_connection_state(conn):
+        """Pool check callback that rejects dead connections without a round trip to the server"""
+        if conn.closed or conn.broken:
+            raise OperationalError("Connection is closed or broken")
 
     def get_new_connection(self, conn_params):
         """Get a connection from the pool with error handling and failover"""
@@ -150,22 +139,10 @@ class DatabaseWrapper(PostgresDatabaseWrpper):
                         # If it's not a connection limit issue or we've exceeded retries
                         raise
 
-        try:
-            conn = self.pool.getconn()
-            # Validate connection before returning
-            if hasattr(conn, 'closed') and not conn.closed:
-                return conn
-            else:
-                # Connection is closed, remove it and try again
-                self.pool.putconn(conn, close=True)
-                return self.pool.getconn()
-        except Exception as e:
-            if "too many clients already" in str(e):
-                # Try emergency cleanup of connections
-                self._cleanup_connections()
-                # Try again after cleanup
-                return self.pool.getconn()
-            raise
+        # The pool's check callback already discards closed or broken connections.
+        # When the pool is exhausted getconn() queues until timeout and then raises
+        # PoolTimeout (or TooManyRequests past max_waiting) instead of recreating the pool.
+        return self.pool.getconn()
 
     def close(self, *args, **kwargs):
         """Return the connection to the pool instead of closing it."""
@@ -190,33 +167,6 @@ class DatabaseWrapper(PostgresDatabaseWrpper):
                 pass
             self.connection = None
 
-    def _cleanup_connections(self):
-        """Emergency cleanup of connections when pool is full"""
-        if not self.pool:
-            return False
-
-        try:
-            # Close and recreate pool
-            current_pool = self.pool
-            with DatabaseWrapper._lock:
-                self._connection_pools.pop(self.alias, None)
-
-            # Close previous pool
-            try:
-                current_pool.close()
-            except:
-                pass
-
-            # Allow a small delay for connections to be properly closed
-            time.sleep(0.5)
-
-            # Getting pool will recreate it
-            _ = self.pool
-            return True
-        except Exception as e:
-            logging.error(f"Error during emergency connection cleanup: {e}")
-            return False
-
     def close_if_unusable_or_obsolete(self, *args, **kwargs):
         """Modified to work with the connection pool."""
         if self.connection is None:
@@ -225,13 +175,14 @@ class DatabaseWrapper(PostgresDatabaseWrpper):
         if not self.pool:
             return super().close_if_unusable_or_obsolete(*args, **kwargs)
 
-        # Check if connection is usable
-        try:
-            if not self.is_usable():
-                self.close()
-        except:
-            # If we can't determine if it's usable, close it to be safe
-            self.close()
+        # psycopg tracks the closed state locally, so this costs no query
+        if self.connection.closed:
+            self.connection = None
+            return
+
+        # Hand the connection back to the pool at the end of every request;
+        # the pool's check callback validates it on the next checkout
+        self.close()
 
     def close_pool(self):
         """Close the connection pool for this alias"""
@@ -243,22 +194,26 @@ class DatabaseWrapper(PostgresDatabaseWrpper):
                         del self._connection_pools[self.alias]
                     except Exception as e:
                         logging.error(f"Error closing pool {self.alias}: {e}")
+            self._cached_pool = None
 
     def get_pool_status(self):
         """Returns detailed status information about the connection pool."""
         if not self.pool:
             return {"status": "disabled"}
 
+        stats = self.pool.get_stats()
+        # psycopg_pool has no busy counter: busy connections are the opened ones not available
+        busy = stats["pool_size"] - stats["pool_available"]
+
         return {
             "status": "active",
-            "size": self.pool.size,
-            "min_size": self.pool.min_size,
-            "max_size": self.pool.max_size,
-            "max_overflow": self.pool.max_overflow,
-            "overflow": self.pool.overflow,
-            "idle": self.pool.idle,
-            "busy": self.pool.busy,
-            "usage_percent": (self.pool.busy / self.pool.max_size * 100) if self.pool.max_size > 0 else 0,
+            "size": stats["pool_size"],
+            "min_size": stats["pool_min"],
+            "max_size": stats["pool_max"],  # MAX_CONNECTIONS + MAX_OVERFLOW
+            "idle": stats["pool_available"],
+            "busy": busy,
+            "waiting": stats["requests_waiting"],
+            "usage_percent": (busy / stats["pool_max"] * 100) if stats["pool_max"] > 0 else 0,
             "created_at": self._pool_settings.get(self.alias, {}).get('created_at')
         }
 
@@ -268,7 +223,8 @@ class DatabaseWrapper(PostgresDatabaseWrpper):
             return False
 
         try:
-            self.pool.resize(self.min_connections)
+            # resize() defaults max_size to min_size, so pass the configured maximum explicitly
+            self.pool.resize(self.min_connections, self.max_connections + self.max_overflow)
             return True
         except Exception as e:
             logging.error(f"Error resizing pool: {e}")